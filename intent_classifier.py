@@ -1,49 +1,93 @@
+import os
+
+# Pin BLAS/OpenMP pools to one thread before sklearn loads; single-message
+# inference gains nothing from a pool and spawning one inside the first
+# predict would add latency to the first user message
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.pipeline import Pipeline
+import functools
 import joblib
 from nltk.corpus import stopwords
 import nltk
-import os
+
+# Download required NLTK data and cache the stopword list once at import;
+# stopwords.words() re-reads the corpus file from disk on every call
+try:
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    nltk.download('stopwords')
+
+_EN_STOPWORDS = stopwords.words('english')
+
+# Bump when the saved payload layout or pipeline structure changes;
+# a mismatched file raises instead of silently retraining at startup
+_MODEL_VERSION = 1
 
 
 class IntentClassifier:
     def __init__(self, model_path='intent_classifier.joblib', data_path='data/intents.csv'):
-        # Download required NLTK data
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-
         self.model_path = model_path
         self.data_path = data_path
 
-        # Try to load existing model
+        # Try to load existing model; a corrupt or incompatible file
+        # raises rather than triggering a multi-second silent retrain
+        # on every chatbot start
         if os.path.exists(model_path):
-            try:
-                self.pipeline = joblib.load(model_path)
-                print(f"Loaded existing model from {model_path}")
-            except Exception as e:
-                print(f"Error loading model: {e}")
-                self._initialize_and_train()
+            self.pipeline = self._load_pipeline(model_path)
+            print(f"Loaded existing model from {model_path}")
+            self._warm_up()
         else:
             print(f"No model found at {model_path}, training new model...")
             self._initialize_and_train()
 
+        # Memoize per-message predictions: confirmation-style vocabulary
+        # ("yes", "no", "confirm", ...) repeats constantly across turns,
+        # so cache hits skip the pipeline entirely
+        self._predict_cached = functools.lru_cache(maxsize=1024)(
+            self._predict_text)
+
+    @staticmethod
+    def _load_pipeline(path):
+        """Load a saved model payload, validating its version sentinel"""
+        payload = joblib.load(path)
+        if not isinstance(payload, dict) or payload.get('version') != _MODEL_VERSION:
+            raise RuntimeError(
+                f"Model file {path} is incompatible with version "
+                f"{_MODEL_VERSION}; delete it or retrain explicitly.")
+        return payload['pipeline']
+
+    def _warm_up(self):
+        """Run one throwaway prediction so lazy sklearn imports and BLAS
+        dispatch happen at startup rather than on the first user message"""
+        try:
+            self.pipeline.predict_proba(["hello"])
+        except Exception:
+            pass
+
     def _initialize_pipeline(self):
         self.pipeline = Pipeline([
-            ('tfidf', TfidfVectorizer(
-                stop_words=stopwords.words('english'),
-                min_df=2,
-                max_df=0.95,
+            # Stateless hashing: no learned vocabulary to store or probe,
+            # so the saved model stays small and prediction avoids
+            # per-token dict lookups. alternate_sign=False keeps counts
+            # non-negative for MultinomialNB.
+            ('hash', HashingVectorizer(
+                n_features=2**18,
+                alternate_sign=False,
+                stop_words=_EN_STOPWORDS,
                 ngram_range=(1, 2)
             )),
+            ('tfidf', TfidfTransformer()),
             ('clf', MultinomialNB())
-        ])
+            # Memoize fitted transformer output on disk so retrains on
+            # unchanged data skip the tokenization/IDF pass
+        ], memory='.sklearn_cache')
 
     def _initialize_and_train(self):
         self._initialize_pipeline()
@@ -52,6 +96,7 @@ class IntentClassifier:
             print("Model trained successfully!")
             print(f"Accuracy: {metrics['accuracy']:.2f}")
             self.save_model()
+            self._warm_up()
         except Exception as e:
             print(f"Error during training: {e}")
             raise
@@ -62,23 +107,47 @@ class IntentClassifier:
             raise ValueError(
                 "No model available for prediction. Please train or load a model first.")
 
-        # Get prediction probabilities
+        # Normalize before the cache lookup; the vectorizer lowercases
+        # anyway, so this doesn't change what the model sees
+        return self._predict_cached(text.strip().lower())
+
+    def _predict_text(self, text):
+        # Single pipeline invocation: derive the label from the
+        # probabilities instead of running predict() a second time
         pred_proba = self.pipeline.predict_proba([text])[0]
-        max_confidence = np.max(pred_proba)
+        best = int(np.argmax(pred_proba))
 
-        if max_confidence > 0.4:  # Confidence threshold
-            return self.pipeline.predict([text])[0]
+        if pred_proba[best] > 0.4:  # Confidence threshold
+            return self.pipeline.classes_[best]
         else:
             return "unknown"
 
+    def predict_batch(self, texts):
+        """Classify many texts in one pipeline call to amortize vectorizer overhead"""
+        if not hasattr(self, 'pipeline'):
+            raise ValueError(
+                "No model available for prediction. Please train or load a model first.")
+
+        pred_probas = self.pipeline.predict_proba(texts)
+        best = pred_probas.argmax(axis=1)
+        confidences = pred_probas[np.arange(len(texts)), best]
+        classes = self.pipeline.classes_
+
+        return list(np.where(confidences > 0.4, classes[best], "unknown"))
+
     def train(self, data_path=None, test_size=0.2, random_state=42):
         if data_path is None:
             data_path = self.data_path
 
-        # Load and prepare the data
-        df = pd.read_csv(data_path)
-        X = df['text'].values
-        y = df['intent'].values
+        # Load only the two training columns with explicit dtypes so
+        # pandas skips inference over anything else in the file
+        df = pd.read_csv(
+            data_path,
+            usecols=['text', 'intent'],
+            dtype={'text': 'string', 'intent': 'category'}
+        )
+        X = df['text'].to_numpy()
+        y = df['intent'].to_numpy()
 
         # Split the data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -107,11 +176,21 @@ class IntentClassifier:
     def save_model(self, path=None):
         if path is None:
             path = self.model_path
-        joblib.dump(self.pipeline, path)
+
+        # float64 precision is irrelevant against the 0.4 confidence
+        # threshold; float32 halves the bytes read per prediction
+        clf = self.pipeline.named_steps['clf']
+        clf.feature_log_prob_ = clf.feature_log_prob_.astype(np.float32)
+        clf.class_log_prior_ = clf.class_log_prior_.astype(np.float32)
+
+        # zlib level 3 is near-optimal for the mostly-uniform NB
+        # log-prob arrays and keeps the file small on disk
+        joblib.dump({'pipeline': self.pipeline, 'version': _MODEL_VERSION},
+                    path, compress=3)
         print(f"Model saved to {path}")
 
     def load_model(self, path=None):
         if path is None:
             path = self.model_path
-        self.pipeline = joblib.load(path)
+        self.pipeline = self._load_pipeline(path)
         print(f"Model loaded from {path}")
@@ -1,22 +1,49 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from datetime import date
+import re
 from services.auth import Auth, UserInfo
 from services.booking import BookingService
 from services.flight import FlightService
-from intent_classifier import IntentClassifier
+from transactions.booking import _get_intent_classifier
 from transactions.factory import TransactionFactory
 from transactions.transaction import BaseTransaction
 
+# First-stage intent patterns, compiled once at import. Messages that
+# match exactly one pattern skip the TF-IDF + NB inference entirely;
+# anything ambiguous still goes through the classifier.
+_FAST_INTENT_PATTERNS = [
+    (re.compile(r'\b(book|booking|reserve)\b', re.IGNORECASE), 'booking'),
+    (re.compile(r'\b(status|delayed|on time)\b', re.IGNORECASE), 'status'),
+    (re.compile(r'\b(hi|hello|hey)\b', re.IGNORECASE), 'greeting'),
+    (re.compile(r'\b(bye|goodbye)\b', re.IGNORECASE), 'farewell'),
+]
+
+# Words that flip the meaning of a keyword match ("cancel my booking"
+# is not a booking request); their presence sends the message to the
+# classifier instead of trusting the fast path
+_NEGATING_RE = re.compile(
+    r'\b(cancel|delete|remove|change|modify|update|refund)\b', re.IGNORECASE)
+
 
 class FlightBookingChatbot:
     def __init__(self):
         self.auth_service = Auth()
-        self.intent_classifier = IntentClassifier()
+        # Same classifier instance the transactions use: one model load
+        # and one copy in memory per process
+        self.intent_classifier = _get_intent_classifier()
         self.current_transaction = None
 
     def _get_intent(self, message: str) -> str:
         """Classify the user's intent from their message"""
+        if not _NEGATING_RE.search(message):
+            matches = [
+                intent for pattern, intent in _FAST_INTENT_PATTERNS
+                if pattern.search(message)
+            ]
+            if len(matches) == 1:
+                return matches[0]
+
         try:
             return self.intent_classifier.predict(message)
         except ValueError:
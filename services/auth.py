@@ -28,8 +28,9 @@ class Auth:
         self._current_user: Optional[User] = None
 
     def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password using SHA-256 (dispatches to OpenSSL's SHA-NI path)"""
+        encoded = password.encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
 
     def register(self, name: str, email: str, password: str) -> tuple[bool, str]:
         """Register a new user with preferred_class as None initially"""
@@ -2,11 +2,20 @@ from datetime import datetime
 from typing import Optional, List
 from dataclasses import dataclass
 import string
-import random
+import numpy as np
 from decimal import Decimal
 from utils.database import Booking
 from services.flight import Trip
 
+# Reference alphabet as a byte array so a whole batch of candidates can be
+# built with one vectorized index instead of per-character random.choice calls
+_REFERENCE_CHARS = np.frombuffer(
+    (string.ascii_uppercase + string.digits).encode(), dtype='S1')
+
+# One generator for all reference draws; constructing a Generator per
+# call costs more than the draw itself
+_REFERENCE_RNG = np.random.default_rng()
+
 
 @dataclass
 class BookingInfo:
@@ -23,16 +32,20 @@ class BookingInfo:
 
     @classmethod
     def from_orm(cls, booking: Booking) -> 'BookingInfo':
-        """Convert Booking ORM object to BookingInfo"""
+        """Convert Booking ORM object to BookingInfo
+
+        Reads the raw foreign-key ids (peewee's _id shortcut) so no lazy
+        SELECT is issued per related row.
+        """
         return cls(
             id=booking.id,
             reference=booking.reference,
             trip_type=booking.trip_type,
-            outbound_flight_id=booking.outbound_flight.id,
-            return_flight_id=booking.return_flight.id if booking.return_flight else None,
+            outbound_flight_id=booking.outbound_flight_id,
+            return_flight_id=booking.return_flight_id,
             travel_class=booking.travel_class,
             created_at=booking.created_at,
-            user_id=booking.user.id,
+            user_id=booking.user_id,
             total_amount=float(booking.total_amount)
         )
 
@@ -43,23 +56,38 @@ class BookingService:
     # Class constants
     VALID_TRAVEL_CLASSES = frozenset({'FIRST', 'BUSINESS', 'ECONOMY'})
     REFERENCE_LENGTH = 6
+    REFERENCE_BATCH = 16
 
     @staticmethod
     def _generate_reference() -> str:
         """
         Generate a unique booking reference
 
+        Draws a batch of candidate codes at once and checks them against
+        the database in a single query, so the common no-collision case
+        costs one round trip instead of one per attempt.
+
         Returns:
             str: A unique 6-character reference code
         """
-        while True:
-            chars = string.ascii_uppercase + string.digits
-            reference = ''.join(random.choice(chars)
-                                for _ in range(BookingService.REFERENCE_LENGTH))
+        length = BookingService.REFERENCE_LENGTH
 
-            exists = Booking.select().where(Booking.reference == reference).exists()
-            if not exists:
-                return reference
+        while True:
+            idx = _REFERENCE_RNG.integers(
+                0, len(_REFERENCE_CHARS),
+                size=(BookingService.REFERENCE_BATCH, length))
+            raw = _REFERENCE_CHARS[idx].tobytes().decode()
+            candidates = [raw[i:i + length]
+                          for i in range(0, len(raw), length)]
+
+            taken = {
+                booking.reference
+                for booking in Booking.select(Booking.reference)
+                                      .where(Booking.reference.in_(candidates))
+            }
+            for reference in candidates:
+                if reference not in taken:
+                    return reference
 
     def _calculate_total_amount(self, trip: Trip, travel_class: str) -> Decimal:
         """
@@ -145,12 +173,19 @@ class BookingService:
         Returns:
             List[BookingInfo]: List of user's bookings, sorted by creation date
         """
-        bookings = (Booking
-                    .select()
-                    .where(Booking.user == user_id)
-                    .order_by(Booking.created_at.desc()))
-
-        return [BookingInfo.from_orm(booking) for booking in bookings]
+        # Raw row tuples in BookingInfo field order; skips per-row ORM
+        # object construction (FK columns come back as plain ids)
+        rows = (Booking
+                .select(
+                    Booking.id, Booking.reference, Booking.trip_type,
+                    Booking.outbound_flight, Booking.return_flight,
+                    Booking.travel_class, Booking.created_at, Booking.user,
+                    Booking.total_amount)
+                .where(Booking.user == user_id)
+                .order_by(Booking.created_at.desc())
+                .tuples())
+
+        return [BookingInfo(*row[:8], float(row[8])) for row in rows]
 
     def delete_booking(self, booking_id: int, user_id: int) -> bool:
         """
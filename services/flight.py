@@ -1,10 +1,20 @@
 # services/flight.py
+import heapq
 from dataclasses import dataclass
 from datetime import datetime, timedelta, date
-from typing import Optional, List, Dict
+from functools import cached_property
+from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
 from utils.database import Flight
-from peewee import fn, SQL
+from peewee import fn, Case, SQL
+
+# Prefix -> (location, code, base) columns, resolved once instead of via
+# getattr + f-string formatting on every search
+_LOC_COLS = {
+    'origin': (Flight.origin_location, Flight.origin_code, Flight.origin_base),
+    'destination': (Flight.destination_location, Flight.destination_code,
+                    Flight.destination_base),
+}
 
 
 class Rates:
@@ -53,36 +63,60 @@ class FlightInfo:
             base_price=Decimal(str(flight.base_price))
         )
 
+    @classmethod
+    def from_dict(cls, row: Dict) -> 'FlightInfo':
+        """Build FlightInfo from a .dicts() query row, skipping ORM object construction"""
+        return cls(
+            id=row['id'],
+            origin_base=row['origin_base'],
+            origin_location=row['origin_location'],
+            origin_code=row['origin_code'],
+            departure_date=row['departure_date'],
+            departure_time=row['departure_time'],
+            destination_base=row['destination_base'],
+            destination_location=row['destination_location'],
+            destination_code=row['destination_code'],
+            status=row['status'],
+            base_price=Decimal(str(row['base_price']))
+        )
+
 
-@dataclass
+@dataclass(frozen=True)
 class Trip:
     """Data class to represent a complete trip (outbound and optional return flight)"""
     trip_type: str
     outbound_flight: FlightInfo
     return_flight: Optional[FlightInfo] = None
 
-    def _calculate_base_trip_price(self) -> Decimal:
-        """Calculate the base price considering trip type"""
-        total_base = self.outbound_flight.base_price
+    @cached_property
+    def _base_trip_price(self) -> float:
+        """Base trip price as a float, computed once per trip
+
+        Intermediate math stays in float (Decimal is pure-Python and far
+        slower); prices are quantized to Decimal only at the final step.
+        """
+        total_base = float(self.outbound_flight.base_price)
         if self.trip_type == 'ROUNDTRIP' and self.return_flight:
-            total_base += self.return_flight.base_price
+            total_base += float(self.return_flight.base_price)
+
+        return total_base * Rates.TRIP_TYPE_RATES[self.trip_type]
 
-        return total_base * Decimal(str(Rates.TRIP_TYPE_RATES[self.trip_type]))
+    def _class_price(self, travel_class: str) -> Decimal:
+        """Quantize the float price for a class to a two-place Decimal"""
+        return Decimal(
+            f"{self._base_trip_price * Rates.CLASS_RATES[travel_class]:.2f}")
 
     def get_first_class_price(self) -> Decimal:
         """Calculate price for First Class"""
-        base_price = self._calculate_base_trip_price()
-        return round(base_price * Decimal(str(Rates.CLASS_RATES['FIRST'])), 2)
+        return self._class_price('FIRST')
 
     def get_business_class_price(self) -> Decimal:
         """Calculate price for Business Class"""
-        base_price = self._calculate_base_trip_price()
-        return round(base_price * Decimal(str(Rates.CLASS_RATES['BUSINESS'])), 2)
+        return self._class_price('BUSINESS')
 
     def get_economy_class_price(self) -> Decimal:
         """Calculate price for Economy Class"""
-        base_price = self._calculate_base_trip_price()
-        return round(base_price * Decimal(str(Rates.CLASS_RATES['ECONOMY'])), 2)
+        return self._class_price('ECONOMY')
 
     def get_all_class_prices(self) -> Dict[str, Decimal]:
         """Get prices for all classes at once"""
@@ -106,13 +140,32 @@ class FlightService:
             for i in range(-num_days, num_days + 1)
         ]
 
+    def _date_distance_order(self, nearby_dates: List[date], target_date: date) -> Case:
+        """Build a CASE expression ranking rows by days from the target date
+
+        The candidate set is already restricted to nearby_dates, so a
+        small integer CASE replaces the JULIANDAY float math SQLite would
+        otherwise evaluate per row.
+        """
+        return Case(Flight.departure_date, [
+            (d, abs((d - target_date).days)) for d in nearby_dates
+        ])
+
     def _build_location_condition(self, field_prefix: str, location: str) -> SQL:
-        """Build SQL condition for location search"""
-        location = location.lower().strip()
+        """Build SQL condition for location search
+
+        Comparisons carry an explicit COLLATE NOCASE so they stay
+        case-insensitive even against databases created before the
+        columns were declared NOCASE (create_tables(safe=True) never
+        alters existing tables). On current databases the collation
+        matches the column declaration, so indexes still apply.
+        """
+        location_col, code_col, base_col = _LOC_COLS[field_prefix]
+        location = location.strip()
         return (
-            (fn.LOWER(getattr(Flight, f"{field_prefix}_location")) == location) |
-            (fn.LOWER(getattr(Flight, f"{field_prefix}_code")) == location) |
-            (fn.LOWER(getattr(Flight, f"{field_prefix}_base")) == location)
+            (location_col.collate('NOCASE') == location) |
+            (code_col.collate('NOCASE') == location) |
+            (base_col.collate('NOCASE') == location)
         )
 
     def search_flights(
@@ -132,63 +185,89 @@ class FlightService:
         destination_condition = self._build_location_condition(
             'destination', destination)
 
-        # Get outbound flights
-        outbound_flights = (Flight
-                            .select()
-                            .where(
-                                origin_condition &
-                                destination_condition &
-                                (Flight.departure_date.in_(nearby_outbound_dates))
-                            )
-                            .order_by(
-                                fn.ABS(fn.JULIANDAY(Flight.departure_date) -
-                                       fn.JULIANDAY(outbound_date.strftime('%Y-%m-%d'))),
-                                Flight.departure_time
-                            )
-                            .limit(limit))
+        # Get outbound flights as plain rows; no ORM instances needed
+        outbound_rows = (Flight
+                         .select()
+                         .where(
+                             origin_condition &
+                             destination_condition &
+                             (Flight.departure_date.in_(nearby_outbound_dates))
+                         )
+                         .order_by(
+                             self._date_distance_order(
+                                 nearby_outbound_dates, outbound_date),
+                             Flight.departure_time
+                         )
+                         .limit(limit)
+                         .dicts())
+        outbound_flights = [FlightInfo.from_dict(row) for row in outbound_rows]
 
         # Handle one-way trips
         if return_date is None:
             return [
-                Trip(
-                    trip_type='ONEWAY',
-                    outbound_flight=FlightInfo.from_orm(outbound)
-                )
+                Trip(trip_type='ONEWAY', outbound_flight=outbound)
                 for outbound in outbound_flights
             ]
 
-        # Handle round trips
+        # Handle round trips: fetch all candidate return flights once and
+        # match them to outbounds in Python instead of querying per outbound
         nearby_return_dates = self._get_nearby_dates(return_date)
         return_origin_condition = self._build_location_condition(
             'origin', destination)
         return_destination_condition = self._build_location_condition(
             'destination', origin)
 
+        return_rows = (Flight
+                       .select()
+                       .where(
+                           return_origin_condition &
+                           return_destination_condition &
+                           (Flight.departure_date.in_(nearby_return_dates))
+                       )
+                       .order_by(
+                           self._date_distance_order(
+                               nearby_return_dates, return_date),
+                           Flight.departure_time
+                       )
+                       .dicts())
+        return_candidates = [FlightInfo.from_dict(row) for row in return_rows]
+
         for outbound in outbound_flights:
-            return_flights = (Flight
-                              .select()
-                              .where(
-                                  return_origin_condition &
-                                  return_destination_condition &
-                                  (Flight.departure_date.in_(nearby_return_dates)) &
-                                  (Flight.departure_date > outbound.departure_date)
-                              )
-                              .order_by(
-                                  fn.ABS(fn.JULIANDAY(Flight.departure_date) -
-                                         fn.JULIANDAY(return_date.strftime('%Y-%m-%d'))),
-                                  Flight.departure_time
-                              )
-                              .limit(1))
-
-            for return_flight in return_flights:
-                trips.append(Trip(
-                    trip_type='ROUNDTRIP',
-                    outbound_flight=FlightInfo.from_orm(outbound),
-                    return_flight=FlightInfo.from_orm(return_flight)
-                ))
-
-        return sorted(
+            for return_flight in return_candidates:
+                if return_flight.departure_date > outbound.departure_date:
+                    trips.append(Trip(
+                        trip_type='ROUNDTRIP',
+                        outbound_flight=outbound,
+                        return_flight=return_flight
+                    ))
+                    break
+
+        # O(N log limit) partial sort instead of sorting all trips
+        return heapq.nsmallest(
+            limit,
             trips,
             key=lambda x: abs(
                 (x.outbound_flight.departure_date - outbound_date).days)
-        )[:limit]
+        )
+
+    def search_flights_with_prices(
+        self,
+        origin: str,
+        destination: str,
+        outbound_date: date,
+        travel_class: str,
+        return_date: Optional[date] = None,
+        limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> List[Tuple[Trip, Decimal]]:
+        """Search for flights and price each trip in a single call
+
+        Returns (trip, price) pairs for the given travel class, so
+        callers get results and fares from one service call instead of
+        a search followed by per-trip pricing.
+        """
+        trips = self.search_flights(
+            origin, destination, outbound_date, return_date, limit)
+        return [
+            (trip, trip.get_all_class_prices()[travel_class])
+            for trip in trips
+        ]
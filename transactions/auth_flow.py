@@ -23,15 +23,18 @@ class AuthFlow:
             'name': None
         }
 
+    # State -> handler name, resolved with one dict lookup per turn
+    _DISPATCH = {
+        AuthFlowStates.INIT: '_handle_init',
+        AuthFlowStates.AWAITING_EMAIL: '_handle_email',
+        AuthFlowStates.AWAITING_PASSWORD: '_handle_password',
+        AuthFlowStates.AWAITING_NAME: '_handle_name',
+    }
+
     def process(self, message: str) -> str:
-        if self.state == AuthFlowStates.INIT:
-            return self._handle_init(message)
-        elif self.state == AuthFlowStates.AWAITING_EMAIL:
-            return self._handle_email(message)
-        elif self.state == AuthFlowStates.AWAITING_PASSWORD:
-            return self._handle_password(message)
-        elif self.state == AuthFlowStates.AWAITING_NAME:
-            return self._handle_name(message)
+        handler_name = self._DISPATCH.get(self.state)
+        if handler_name:
+            return getattr(self, handler_name)(message)
         return "An error occurred in authentication."
 
     def _handle_init(self, message: str) -> str:
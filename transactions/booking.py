@@ -1,33 +1,86 @@
+import re
 from typing import Dict, Any, Optional
-from datetime import datetime, date
+from datetime import date
+from decimal import Decimal
+from enum import IntEnum
 from services.booking import BookingService
 from services.flight import FlightService, Trip
 from .transaction import BaseTransaction
 from intent_classifier import IntentClassifier
 
-
-class BookingStates:
-    INIT = "INIT"
-    ORIGIN = "ORIGIN"
-    DESTINATION = "DESTINATION"
-    OUTBOUND_DATE = "OUTBOUND_DATE"
-    RETURN_DATE = "RETURN_DATE"
-    TRAVEL_CLASS = "TRAVEL_CLASS"
-    FLIGHT_SELECTION = "FLIGHT_SELECTION"  # New state
-    CONFIRMATION = "CONFIRMATION"
-    COMPLETE = "COMPLETE"
+# One classifier shared by every transaction; loading the model per
+# transaction would repeat the load cost and duplicate it in memory
+_shared_intent_classifier = None
+
+
+def _get_intent_classifier() -> IntentClassifier:
+    global _shared_intent_classifier
+    if _shared_intent_classifier is None:
+        _shared_intent_classifier = IntentClassifier()
+    return _shared_intent_classifier
+
+
+# Flight-table layout constants: %-formatting is measurably cheaper than
+# str.format for simple padded cells, and the strings are built once here
+_ONEWAY_WIDTHS = (5, 10, 10, 10, 6, 11)
+_ONEWAY_HDR_FMT = "| %-5s | %-10s | %-10s | %-10s | %-6s | %-11s |"
+_ONEWAY_ROW_FMT = "| %-5s | %-10s | %-10s | %-10s | %-6s | £%9s |"
+_ONEWAY_SEP = "+" + "+".join("-" * (w + 2) for w in _ONEWAY_WIDTHS) + "+"
+_ROUNDTRIP_WIDTHS = (5, 10, 10, 10, 10, 11)
+_ROUNDTRIP_HDR_FMT = "| %-5s | %-10s | %-10s | %-10s | %-10s | %-11s |"
+_ROUNDTRIP_ROW_FMT = "| %-5s | %-10s | %-10s | %-10s | %-10s | £%9s |"
+_ROUNDTRIP_SEP = "+" + "+".join("-" * (w + 2) for w in _ROUNDTRIP_WIDTHS) + "+"
+
+# Normalized user input -> canonical travel class; one dict probe instead
+# of an upper() allocation plus set membership, and accepts shorthand
+_CLASS_ALIAS = {
+    'first': 'FIRST', 'business': 'BUSINESS', 'economy': 'ECONOMY',
+    'f': 'FIRST', 'b': 'BUSINESS', 'e': 'ECONOMY',
+}
+
+# Keyword fast-path for the confirmation turn: nearly every reply is one
+# of these words, so a set probe resolves the intent without running the
+# classifier at all
+_CONFIRM_WORDS = frozenset(
+    {'yes', 'y', 'yeah', 'yep', 'confirm', 'ok', 'okay', 'sure', 'proceed'})
+_CANCEL_WORDS = frozenset({'no', 'n', 'nope', 'cancel', 'abort', 'stop'})
+
+# Case-insensitive "round" detector, compiled once: avoids lowercasing a
+# copy of every opening message, and the word boundary rejects false
+# positives like "surround"
+_ROUND_RE = re.compile(r'\bround', re.IGNORECASE)
+
+
+class BookingStates(IntEnum):
+    """Booking flow states; int-valued so dispatch can index a tuple
+    and state compares are plain int compares"""
+    INIT = 0
+    ORIGIN = 1
+    DESTINATION = 2
+    OUTBOUND_DATE = 3
+    RETURN_DATE = 4
+    TRAVEL_CLASS = 5
+    FLIGHT_SELECTION = 6
+    CONFIRMATION = 7
+    COMPLETE = 8
 
 
 class BookingTransaction(BaseTransaction):
-    VALID_CLASSES = {'FIRST', 'BUSINESS', 'ECONOMY'}
+    # Slots continue from BaseTransaction; no __dict__ per instance
+    __slots__ = ('booking_service', 'flight_service', 'intent_classifier',
+                 'state', '_search_cache')
+
+    VALID_CLASSES = frozenset({'FIRST', 'BUSINESS', 'ECONOMY'})
     MAX_FLIGHTS = 5
 
-    def __init__(self, chatbot):
+    def __init__(self, chatbot, booking_service=None, flight_service=None,
+                 intent_classifier=None):
         super().__init__(chatbot)
-        # Initialize services
-        self.booking_service = BookingService()
-        self.flight_service = FlightService()
-        self.intent_classifier = IntentClassifier()
+        # Shared services injected by TransactionFactory; when constructed
+        # directly, fall back to fresh instances / the shared classifier
+        self.booking_service = booking_service or BookingService()
+        self.flight_service = flight_service or FlightService()
+        self.intent_classifier = intent_classifier or _get_intent_classifier()
         # Initialize state
         self.state = BookingStates.INIT
         self.context = {
@@ -41,6 +94,9 @@ class BookingTransaction(BaseTransaction):
             'selected_trip': None,
             'price': None
         }
+        # Search results keyed by criteria, so re-entering a travel class
+        # (e.g. after a typo) doesn't redo the SQL search
+        self._search_cache = {}
 
     @property
     def requires_auth(self) -> bool:
@@ -53,54 +109,53 @@ class BookingTransaction(BaseTransaction):
         return self._process_internal(message)
 
     def _process_internal(self, message: str) -> str:
-        handlers = {
-            BookingStates.INIT: self._handle_init,
-            BookingStates.ORIGIN: self._handle_origin,
-            BookingStates.DESTINATION: self._handle_destination,
-            BookingStates.OUTBOUND_DATE: self._handle_outbound_date,
-            BookingStates.RETURN_DATE: self._handle_return_date,
-            BookingStates.TRAVEL_CLASS: self._handle_travel_class,
-            BookingStates.FLIGHT_SELECTION: self._handle_flight_selection,
-            BookingStates.CONFIRMATION: self._handle_confirmation
-        }
-        handler = handlers.get(self.state)
+        handler = self._HANDLERS[self.state]
         if handler:
             try:
-                return handler(message)
+                return handler(self, message)
             except Exception as e:
-                print(f"Debug - Error in {self.state}: {str(e)}")
+                print(f"Debug - Error in {self.state.name}: {str(e)}")
                 self.state = BookingStates.COMPLETE
                 return "Sorry, something went wrong. Please start a new booking."
         return "An error occurred in the booking process."
 
-    def _format_flight_table(self, trips: list[Trip], travel_class: str) -> str:
-        """Format available flights into a readable table."""
-        if self.context['trip_type'] == 'ONEWAY':
-            headers = [
-                "Option",
-                "Departure",
-                "Arrival",
-                "Date",
-                "Time",
-                f"Price ({travel_class})"
-            ]
-
-            # Create separator line
-            separator = "+-------+------------+------------+------------+--------+-------------+"
-
-            # Create header
-            table = [
-                separator,
-                "| {:5} | {:10} | {:10} | {:10} | {:6} | {:11} |".format(
-                    *headers),
-                separator
-            ]
-
-            # Add rows
-            for idx, trip in enumerate(trips, 1):
+    def _format_flight_table(
+        self,
+        trips: list[tuple[Trip, Decimal]],
+        travel_class: str
+    ) -> str:
+        """Format available (trip, price) pairs into a readable table."""
+        return "\n".join(self._iter_table_lines(trips, travel_class))
+
+    def _iter_table_lines(self, trips: list[tuple[Trip, Decimal]], travel_class: str):
+        """Yield the table line by line.
+
+        Rows are rendered with the module-level %-format constants, which
+        skip str.format's per-call format-spec parsing; streaming the
+        lines keeps one pass and no intermediate list growth however
+        large the flight set gets.
+        """
+        one_way = self.context['trip_type'] == 'ONEWAY'
+
+        if one_way:
+            separator = _ONEWAY_SEP
+            hdr_fmt, row_fmt = _ONEWAY_HDR_FMT, _ONEWAY_ROW_FMT
+            headers = ("Option", "Departure", "Arrival", "Date", "Time",
+                       f"Price ({travel_class})")
+        else:  # ROUNDTRIP
+            separator = _ROUNDTRIP_SEP
+            hdr_fmt, row_fmt = _ROUNDTRIP_HDR_FMT, _ROUNDTRIP_ROW_FMT
+            headers = ("Option", "Outbound", "Return", "Out Date", "Ret Date",
+                       f"Price ({travel_class})")
+
+        yield separator
+        yield hdr_fmt % headers
+        yield separator
+
+        for idx, (trip, price) in enumerate(trips, 1):
+            if one_way:
                 flight = trip.outbound_flight
-                price = trip.get_all_class_prices()[travel_class]
-                row = "| {:5} | {:10} | {:10} | {:10} | {:6} | £{:9} |".format(
+                row = row_fmt % (
                     f"#{idx}",
                     flight.origin_code,
                     flight.destination_code,
@@ -108,36 +163,10 @@ class BookingTransaction(BaseTransaction):
                     flight.departure_time.strftime("%H:%M"),
                     price
                 )
-                table.append(row)
-                table.append(separator)
-
-        else:  # ROUNDTRIP
-            headers = [
-                "Option",
-                "Outbound",
-                "Return",
-                "Out Date",
-                "Ret Date",
-                f"Price ({travel_class})"
-            ]
-
-            # Create separator line
-            separator = "+-------+------------+------------+------------+------------+-------------+"
-
-            # Create header
-            table = [
-                separator,
-                "| {:5} | {:10} | {:10} | {:10} | {:10} | {:11} |".format(
-                    *headers),
-                separator
-            ]
-
-            # Add rows
-            for idx, trip in enumerate(trips, 1):
+            else:
                 outbound = trip.outbound_flight
                 return_flight = trip.return_flight
-                price = trip.get_all_class_prices()[travel_class]
-                row = "| {:5} | {:10} | {:10} | {:10} | {:10} | £{:9} |".format(
+                row = row_fmt % (
                     f"#{idx}",
                     f"{outbound.origin_code}-{outbound.destination_code}",
                     f"{return_flight.origin_code}-{return_flight.destination_code}",
@@ -145,31 +174,48 @@ class BookingTransaction(BaseTransaction):
                     return_flight.departure_date.strftime("%Y-%m-%d"),
                     price
                 )
-                table.append(row)
-                table.append(separator)
-
-        return "\n".join(table)
-
-    def _handle_travel_class(self, message: str) -> str:
-        travel_class = message.upper()
 
-        if travel_class not in self.VALID_CLASSES:
-            return "Invalid travel class. Please select ECONOMY, BUSINESS, or FIRST:"
-
-        try:
-            trips = self.flight_service.search_flights(
+            yield row
+            yield separator
+
+    def _search_flights_cached(self, travel_class: str) -> list[tuple[Trip, Decimal]]:
+        """Search and price flights for the current criteria, memoized per transaction"""
+        key = (
+            self.context['origin'],
+            self.context['destination'],
+            self.context['outbound_date'],
+            self.context['return_date'],
+            travel_class,
+            self.MAX_FLIGHTS
+        )
+        trips = self._search_cache.get(key)
+        if trips is None:
+            trips = self.flight_service.search_flights_with_prices(
                 origin=self.context['origin'],
                 destination=self.context['destination'],
                 outbound_date=self.context['outbound_date'],
+                travel_class=travel_class,
                 return_date=self.context['return_date'],
                 limit=self.MAX_FLIGHTS
             )
+            self._search_cache[key] = trips
+        return trips
+
+    def _handle_travel_class(self, message: str) -> str:
+        travel_class = _CLASS_ALIAS.get(message.strip().lower())
+
+        if travel_class is None:
+            return "Invalid travel class. Please select ECONOMY, BUSINESS, or FIRST:"
+
+        try:
+            # One service call returns the trips already priced for the
+            # chosen class
+            trips = self._search_flights_cached(travel_class)
 
             if not trips:
                 self.state = BookingStates.COMPLETE
                 return "Sorry, no flights found for your criteria. Please start a new booking."
 
-            # Store travel class and available trips in context
             self.context['travel_class'] = travel_class
             self.context['available_trips'] = trips
 
@@ -188,13 +234,21 @@ class BookingTransaction(BaseTransaction):
         try:
             selection = int(message)
             if 1 <= selection <= len(self.context['available_trips']):
-                selected_trip = self.context['available_trips'][selection - 1]
-                prices = selected_trip.get_all_class_prices()
-                price = prices.get(self.context['travel_class'])
+                selected_trip, price = self.context['available_trips'][selection - 1]
 
+                # Keep the trip only for create_booking; the summary and
+                # confirmation turns read these flattened strings instead
+                # of walking the trip object graph
+                outbound = selected_trip.outbound_flight
+                return_flight = selected_trip.return_flight
                 self.context.update({
                     'selected_trip': selected_trip,
-                    'price': price
+                    'price': price,
+                    'outbound_date_str': outbound.departure_date.isoformat(),
+                    'return_date_str': (
+                        return_flight.departure_date.isoformat()
+                        if return_flight else None
+                    )
                 })
 
                 self.state = BookingStates.CONFIRMATION
@@ -205,7 +259,14 @@ class BookingTransaction(BaseTransaction):
             return "Please enter a valid number for your flight selection:"
 
     def _handle_confirmation(self, message: str) -> str:
-        intent = self.intent_classifier.predict(message)
+        # Unambiguous one-word replies skip the model inference entirely
+        normalized = message.strip().lower()
+        if normalized in _CONFIRM_WORDS:
+            intent = "confirmation"
+        elif normalized in _CANCEL_WORDS:
+            intent = "cancellation"
+        else:
+            intent = self.intent_classifier.predict(message)
 
         if intent == "confirmation":
             try:
@@ -230,18 +291,17 @@ class BookingTransaction(BaseTransaction):
             return "I'm not sure if you want to confirm or cancel the booking. Please let me know clearly - would you like to proceed with this booking?"
 
     def _get_booking_summary(self) -> str:
-        trip = self.context['selected_trip']
         price = self.context['price']
 
         summary = [
             "Here's a summary of your booking:",
             f"From: {self.context['origin']}",
             f"To: {self.context['destination']}",
-            f"Date: {self.context['outbound_date']}"
+            f"Date: {self.context['outbound_date_str']}"
         ]
 
-        if self.context['return_date']:
-            summary.append(f"Return: {self.context['return_date']}")
+        if self.context['return_date_str']:
+            summary.append(f"Return: {self.context['return_date_str']}")
 
         summary.extend([
             f"Class: {self.context['travel_class']}",
@@ -254,8 +314,8 @@ class BookingTransaction(BaseTransaction):
 
     # Rest of the methods remain the same as in the previous version
     def _handle_init(self, message: str) -> str:
-        self.context['trip_type'] = 'ROUNDTRIP' if "round" in message.lower(
-        ) else 'ONEWAY'
+        self.context['trip_type'] = (
+            'ROUNDTRIP' if _ROUND_RE.search(message) else 'ONEWAY')
         self.state = BookingStates.ORIGIN
         return "Please enter your departure city:"
 
@@ -271,7 +331,7 @@ class BookingTransaction(BaseTransaction):
 
     def _handle_outbound_date(self, message: str) -> str:
         try:
-            outbound_date = datetime.strptime(message, "%Y-%m-%d").date()
+            outbound_date = date.fromisoformat(message.strip())
             if outbound_date < date.today():
                 return "Date cannot be in the past. Please enter a future date (YYYY-MM-DD):"
 
@@ -289,7 +349,7 @@ class BookingTransaction(BaseTransaction):
 
     def _handle_return_date(self, message: str) -> str:
         try:
-            return_date = datetime.strptime(message, "%Y-%m-%d").date()
+            return_date = date.fromisoformat(message.strip())
             if return_date < self.context['outbound_date']:
                 return "Return date must be after outbound date. Please enter a valid date (YYYY-MM-DD):"
 
@@ -303,3 +363,22 @@ class BookingTransaction(BaseTransaction):
     @property
     def is_complete(self) -> bool:
         return self.state == BookingStates.COMPLETE
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        self._search_cache.clear()
+
+    # Handler tuple indexed by BookingStates value, built once at class
+    # creation: dispatch is plain array indexing, no hashing (must follow
+    # the handler definitions above and stay in state order)
+    _HANDLERS = (
+        _handle_init,              # INIT
+        _handle_origin,            # ORIGIN
+        _handle_destination,       # DESTINATION
+        _handle_outbound_date,     # OUTBOUND_DATE
+        _handle_return_date,       # RETURN_DATE
+        _handle_travel_class,      # TRAVEL_CLASS
+        _handle_flight_selection,  # FLIGHT_SELECTION
+        _handle_confirmation,      # CONFIRMATION
+        None,                      # COMPLETE
+    )
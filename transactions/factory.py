@@ -1,19 +1,55 @@
-from typing import Optional
-from transactions.booking import BookingTransaction
-from transactions.status import StatusTransaction
-from transactions.transaction import BaseTransaction
-
-
-class TransactionFactory:
-    _transactions = {
-        'booking': BookingTransaction,
-        'status': StatusTransaction,
-        # Add more transaction types here
-    }
-
-    @classmethod
-    def create_transaction(cls, intent: str, chatbot) -> Optional[BaseTransaction]:
-        transaction_class = cls._transactions.get(intent)
-        if transaction_class:
-            return transaction_class(chatbot)
-        return None
+from typing import Optional
+from services.booking import BookingService
+from services.flight import FlightService
+from transactions.booking import BookingTransaction, _get_intent_classifier
+from transactions.status import StatusTransaction
+from transactions.transaction import BaseTransaction
+
+# Shared service singletons, created on first use: every transaction
+# gets the same instances, so N concurrent sessions cost one model load
+# instead of N, and importing this module stays free
+_booking_service = None
+_flight_service = None
+
+
+def _get_booking_service() -> BookingService:
+    global _booking_service
+    if _booking_service is None:
+        _booking_service = BookingService()
+    return _booking_service
+
+
+def _get_flight_service() -> FlightService:
+    global _flight_service
+    if _flight_service is None:
+        _flight_service = FlightService()
+    return _flight_service
+
+
+class TransactionFactory:
+    _transactions = {
+        'booking': BookingTransaction,
+        'status': StatusTransaction,
+        # Add more transaction types here
+    }
+
+    # Constructor kwarg -> singleton getter per intent, for transactions
+    # that take injected services
+    _services = {
+        'booking': {
+            'booking_service': _get_booking_service,
+            'flight_service': _get_flight_service,
+            'intent_classifier': _get_intent_classifier,
+        },
+    }
+
+    @classmethod
+    def create_transaction(cls, intent: str, chatbot) -> Optional[BaseTransaction]:
+        transaction_class = cls._transactions.get(intent)
+        if transaction_class:
+            kwargs = {
+                name: getter()
+                for name, getter in cls._services.get(intent, {}).items()
+            }
+            return transaction_class(chatbot, **kwargs)
+        return None
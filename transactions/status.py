@@ -2,6 +2,8 @@ from transactions.transaction import BaseTransaction
 
 
 class StatusTransaction(BaseTransaction):
+    __slots__ = ()
+
     def __init__(self, chatbot):
         super().__init__(chatbot)
         self.context['booking_ref'] = None
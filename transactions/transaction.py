@@ -5,6 +5,11 @@ from .auth_flow import AuthFlow
 
 
 class BaseTransaction(ABC):
+    # Slotted instances skip the per-instance __dict__; with one live
+    # transaction per session this is the bulk of per-session memory
+    __slots__ = ('chatbot', 'auth_service', 'context',
+                 'auth_flow', '_paused_for_auth')
+
     def __init__(self, chatbot):
         self.chatbot = chatbot
         self.auth_service = chatbot.auth_service